@@ -1,38 +1,89 @@
 import asyncio
+import itertools
+import re
 import sys
 from telsuit_core import Colors, get_config as load_config, save_config
 from telsuit_enhancer import run_enhancer
 from telsuit_cleaner import run_cleaner
 
+# --- Input whitelists for the config editor ---
+_PHONE_RE = re.compile(r"\+\d{4,31}", re.ASCII)
+_API_ID_RE = re.compile(r"\d{1,16}", re.ASCII)
+_API_HASH_RE = re.compile(r"[0-9a-fA-F]{32}")
+_CHANNEL_RE = re.compile(r"@\w{5,32}", re.ASCII)
+# Custom emoji document IDs are 64-bit integers
+_EMOJI_ID_RE = re.compile(r"\d{1,20}", re.ASCII)
+
+# --- Static menu text, built once at import ---
+_MAIN_MENU = (
+    f"\n{Colors.BOLD}{Colors.GREEN}==============================\n"
+    "        TelSuit Main Menu\n"
+    "==============================\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Emoji Enhancer Module\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Channel Cleaner Module\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} Settings / Config\n"
+    f"{Colors.YELLOW}4.{Colors.RESET} Exit\n"
+    "------------------------------"
+)
+_CONFIG_MENU = (
+    f"\n{Colors.CYAN}--- Shared Configuration Menu ---{Colors.RESET}\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Add / Delete Admins\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Add / Delete Channels\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} Manage Emoji Map\n"
+    f"{Colors.YELLOW}4.{Colors.RESET} Reset Configuration\n"
+    f"{Colors.YELLOW}5.{Colors.RESET} View Current Configuration\n"
+    f"{Colors.YELLOW}6.{Colors.RESET} Return to Main Menu"
+)
+_ADMIN_MENU = (
+    f"\n{Colors.CYAN}--- Manage Admin Accounts ---{Colors.RESET}\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Add Admin\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Delete Admin\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} Return"
+)
+_CHANNEL_MENU = (
+    f"\n{Colors.CYAN}--- Manage Channels ---{Colors.RESET}\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Add Channel\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Delete Channel\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} Return"
+)
+_EMOJI_MENU = (
+    f"\n{Colors.CYAN}--- Manage Emoji Map ---{Colors.RESET}\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Add / Update Emoji ID\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Delete Emoji ID\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} View Emoji Map\n"
+    f"{Colors.YELLOW}4.{Colors.RESET} Return"
+)
+
 
 async def run_config_editor(config):
     """Advanced shared configuration editor."""
     while True:
-        print(f"\n{Colors.CYAN}--- Shared Configuration Menu ---{Colors.RESET}")
-        print(f"{Colors.YELLOW}1.{Colors.RESET} Add / Delete Admins")
-        print(f"{Colors.YELLOW}2.{Colors.RESET} Add / Delete Channels")
-        print(f"{Colors.YELLOW}3.{Colors.RESET} Manage Emoji Map")
-        print(f"{Colors.YELLOW}4.{Colors.RESET} Reset Configuration")
-        print(f"{Colors.YELLOW}5.{Colors.RESET} View Current Configuration")
-        print(f"{Colors.YELLOW}6.{Colors.RESET} Return to Main Menu")
+        print(_CONFIG_MENU)
         choice = input("> ").strip()
 
         # --- Admin management ---
         if choice == "1":
+            pending = False
             while True:
-                print(f"\n{Colors.CYAN}--- Manage Admin Accounts ---{Colors.RESET}")
-                print(f"{Colors.YELLOW}1.{Colors.RESET} Add Admin")
-                print(f"{Colors.YELLOW}2.{Colors.RESET} Delete Admin")
-                print(f"{Colors.YELLOW}3.{Colors.RESET} Return")
+                print(_ADMIN_MENU)
                 sub_choice = input("> ").strip()
 
                 if sub_choice == "1":
                     phone = input("Enter admin phone number (e.g. +1234567890): ").strip()
+                    if not _PHONE_RE.fullmatch(phone):
+                        print("Invalid phone number.")
+                        continue
                     api_id = input("Enter API ID: ").strip()
+                    if not _API_ID_RE.fullmatch(api_id):
+                        print("Invalid API ID (digits only).")
+                        continue
                     api_hash = input("Enter API Hash: ").strip()
+                    if not _API_HASH_RE.fullmatch(api_hash):
+                        print("Invalid API Hash (32 hex characters).")
+                        continue
                     config.setdefault("admins", {})
                     config["admins"][phone] = {"api_id": api_id, "api_hash": api_hash}
-                    save_config(config)
+                    pending = True
                     print(f"{Colors.GREEN}✅ Admin {phone} added/updated.{Colors.RESET}")
 
                 elif sub_choice == "2":
@@ -45,32 +96,33 @@ async def run_config_editor(config):
                         print(f"{i}. {phone}")
                     idx = input("Select number to delete: ").strip()
                     if idx.isdigit() and 1 <= int(idx) <= len(admins):
-                        phone = list(admins.keys())[int(idx) - 1]
+                        phone = next(itertools.islice(admins, int(idx) - 1, None))
                         del admins[phone]
-                        save_config(config)
+                        pending = True
                         print(f"❌ Admin {phone} deleted.")
                     else:
                         print("Invalid selection.")
                 elif sub_choice == "3":
+                    # Flush all edits from this submenu in a single write
+                    if pending:
+                        save_config(config)
                     break
                 else:
                     print("Invalid choice.")
 
         # --- Channel management ---
         elif choice == "2":
+            pending = False
             while True:
-                print(f"\n{Colors.CYAN}--- Manage Channels ---{Colors.RESET}")
-                print(f"{Colors.YELLOW}1.{Colors.RESET} Add Channel")
-                print(f"{Colors.YELLOW}2.{Colors.RESET} Delete Channel")
-                print(f"{Colors.YELLOW}3.{Colors.RESET} Return")
+                print(_CHANNEL_MENU)
                 sub_choice = input("> ").strip()
 
                 if sub_choice == "1":
                     ch = input("Enter channel username (e.g. @MyChannel): ").strip()
                     config.setdefault("channels", [])
-                    if ch and ch not in config["channels"]:
+                    if _CHANNEL_RE.fullmatch(ch) and ch not in config["channels"]:
                         config["channels"].append(ch)
-                        save_config(config)
+                        pending = True
                         print(f"{Colors.GREEN}✅ Channel {ch} added.{Colors.RESET}")
                     else:
                         print("Channel already exists or invalid.")
@@ -86,11 +138,14 @@ async def run_config_editor(config):
                     idx = input("Select number to delete: ").strip()
                     if idx.isdigit() and 1 <= int(idx) <= len(channels):
                         removed = channels.pop(int(idx) - 1)
-                        save_config(config)
+                        pending = True
                         print(f"❌ Channel {removed} deleted.")
                     else:
                         print("Invalid selection.")
                 elif sub_choice == "3":
+                    # Flush all edits from this submenu in a single write
+                    if pending:
+                        save_config(config)
                     break
                 else:
                     print("Invalid choice.")
@@ -99,16 +154,15 @@ async def run_config_editor(config):
         elif choice == "3":
             config.setdefault("emoji_map", {})
             while True:
-                print(f"\n{Colors.CYAN}--- Manage Emoji Map ---{Colors.RESET}")
-                print(f"{Colors.YELLOW}1.{Colors.RESET} Add / Update Emoji ID")
-                print(f"{Colors.YELLOW}2.{Colors.RESET} Delete Emoji ID")
-                print(f"{Colors.YELLOW}3.{Colors.RESET} View Emoji Map")
-                print(f"{Colors.YELLOW}4.{Colors.RESET} Return")
+                print(_EMOJI_MENU)
                 sub_choice = input("> ").strip()
 
                 if sub_choice == "1":
                     emoji = input("Enter standard emoji (e.g. 😊): ").strip()
                     cid = input("Enter custom emoji ID: ").strip()
+                    if not emoji or not _EMOJI_ID_RE.fullmatch(cid):
+                        print("Invalid emoji or ID (digits only).")
+                        continue
                     config["emoji_map"][emoji] = cid
                     save_config(config)
                     print(f"{Colors.GREEN}✅ Emoji '{emoji}' mapped to ID {cid}.{Colors.RESET}")
@@ -122,7 +176,7 @@ async def run_config_editor(config):
                         print(f"{i}. {emoji} → ID: {cid}")
                     idx = input("Select number to delete: ").strip()
                     if idx.isdigit() and 1 <= int(idx) <= len(config["emoji_map"]):
-                        key = list(config["emoji_map"].keys())[int(idx) - 1]
+                        key = next(itertools.islice(config["emoji_map"], int(idx) - 1, None))
                         del config["emoji_map"][key]
                         save_config(config)
                         print(f"❌ Emoji '{key}' deleted.")
@@ -165,29 +219,33 @@ async def run_config_editor(config):
             if not admins and not channels and not emoji_map:
                 print("⚠️ No configuration found.")
             else:
+                # Build the whole report first and emit it with a single print
+                lines = []
                 if admins:
-                    print(f"\n{Colors.YELLOW}Admins:{Colors.RESET}")
-                    for i, (phone, creds) in enumerate(admins.items(), start=1):
-                        print(
-                            f"{i}. {phone} → ID:{creds['api_id']}, "
-                            f"HASH:{creds['api_hash'][:6]}****"
-                        )
+                    lines.append(f"\n{Colors.YELLOW}Admins:{Colors.RESET}")
+                    lines.extend(
+                        f"{i}. {phone} → ID:{creds['api_id']}, "
+                        f"HASH:{creds['api_hash'][:6]}****"
+                        for i, (phone, creds) in enumerate(admins.items(), start=1)
+                    )
                 else:
-                    print("No admins configured.")
+                    lines.append("No admins configured.")
 
                 if channels:
-                    print(f"\n{Colors.YELLOW}Channels:{Colors.RESET}")
-                    for i, ch in enumerate(channels, start=1):
-                        print(f"{i}. {ch}")
+                    lines.append(f"\n{Colors.YELLOW}Channels:{Colors.RESET}")
+                    lines.extend(f"{i}. {ch}" for i, ch in enumerate(channels, start=1))
                 else:
-                    print("No channels configured.")
+                    lines.append("No channels configured.")
 
                 if emoji_map:
-                    print(f"\n{Colors.YELLOW}Emoji Map:{Colors.RESET}")
-                    for i, (emoji, cid) in enumerate(emoji_map.items(), start=1):
-                        print(f"{i}. {emoji} → ID: {cid}")
+                    lines.append(f"\n{Colors.YELLOW}Emoji Map:{Colors.RESET}")
+                    lines.extend(
+                        f"{i}. {emoji} → ID: {cid}"
+                        for i, (emoji, cid) in enumerate(emoji_map.items(), start=1)
+                    )
                 else:
-                    print("No emoji mappings configured.")
+                    lines.append("No emoji mappings configured.")
+                print("\n".join(lines))
 
         elif choice == "6":
             print("Returning to main menu...")
@@ -201,14 +259,7 @@ async def main():
     config = load_config()
 
     while True:
-        print(f"\n{Colors.BOLD}{Colors.GREEN}==============================")
-        print("        TelSuit Main Menu")
-        print("==============================")
-        print(f"{Colors.YELLOW}1.{Colors.RESET} Emoji Enhancer Module")
-        print(f"{Colors.YELLOW}2.{Colors.RESET} Channel Cleaner Module")
-        print(f"{Colors.YELLOW}3.{Colors.RESET} Settings / Config")
-        print(f"{Colors.YELLOW}4.{Colors.RESET} Exit")
-        print("------------------------------")
+        print(_MAIN_MENU)
         choice = input("Select an option: ").strip()
 
         if choice == "1":
@@ -227,7 +278,16 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use the libuv-based event loop when available
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
     try:
-        asyncio.run(main())
+        if uvloop:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Exited by user.{Colors.RESET}")
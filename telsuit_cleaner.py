@@ -1,10 +1,16 @@
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 import asyncio
+import atexit
+import functools
+import io
+import logging
+import queue
 import re
 import os
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from telethon import TelegramClient
-from telethon.tl.types import Message
+from telethon.errors import FloodWaitError
 from telsuit_core import (
     get_config,
     save_config,
@@ -13,6 +19,10 @@ from telsuit_core import (
     print_warning,
     print_success,
     Colors,
+    TokenBucket,
+    LOG_FILE,
+    LOG_MAX_BYTES,
+    LOG_BACKUPS,
 )
 
 # ============================================================
@@ -20,62 +30,173 @@ from telsuit_core import (
 # ============================================================
 
 
-def _ensure_rotating_logs() -> None:
-    """Prevent log files from growing indefinitely."""
-    for h in list(logger.handlers):
-        if isinstance(h, RotatingFileHandler):
-            return
-    rotating = RotatingFileHandler(
-        filename="telsuit.log",
-        maxBytes=1_000_000,
-        backupCount=3,
-        encoding="utf-8",
-    )
-    rotating.setFormatter(logger.handlers[0].formatter if logger.handlers else None)
-    logger.addHandler(rotating)
-
-
-_ensure_rotating_logs()
+def _install_queued_file_logging() -> None:
+    """Move file logging (and its size rotation) onto a background thread."""
+    if getattr(logger, "_telsuit_log_queue_installed", False):
+        return
+    # Take over the file handler basicConfig installed rather than opening
+    # telsuit.log a second time, which wrote every record twice
+    root = logging.getLogger()
+    file_handlers = [h for h in root.handlers if isinstance(h, logging.FileHandler)]
+    if not file_handlers:
+        file_handlers = [
+            RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+        ]
+    for h in file_handlers:
+        root.removeHandler(h)
+
+    # File writes happen on the listener thread; callers only enqueue
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(QueueHandler(log_queue))
+    logger._telsuit_log_listener = listener
+    logger._telsuit_log_queue_installed = True
+
+
+_install_queued_file_logging()
 
 
 # ============================================================
 # Helpers
 # ============================================================
 
-async def _delete_messages(client, chat_id, msg_ids, batch=50):
+# Ids per delete request (Telegram accepts up to 100), and max delete
+# batches in flight at once
+_DELETE_BATCH = 100
+_DELETE_CONCURRENCY = 4
+# Telegram caps an album (media group) at 10 items
+_ALBUM_MAX = 10
+
+# (loop, event) pair; the event is cleared while Telegram has us on a flood
+# wait, so every caller pauses
+_FLOOD_GATE = None
+
+
+def _flood_gate():
+    """Return the flood gate for the running loop, creating it on first use."""
+    # Built lazily: before 3.10 an Event binds to the loop current at
+    # construction, which at import time is not the asyncio.run loop
+    global _FLOOD_GATE
+    loop = asyncio.get_running_loop()
+    if _FLOOD_GATE is None or _FLOOD_GATE[0] is not loop:
+        gate = asyncio.Event()
+        gate.set()
+        _FLOOD_GATE = (loop, gate)
+    return _FLOOD_GATE[1]
+
+
+# Paces every write request (deletes, sends) ahead of Telegram's flood limits
+_WRITE_BUCKET = TokenBucket(rate=3, capacity=_DELETE_CONCURRENCY)
+
+
+async def _with_flood(op, *args, **kwargs):
+    """Await a Telegram call, sleeping out any FloodWaitError and retrying."""
+    gate = _flood_gate()
+    while True:
+        await gate.wait()
+        await _WRITE_BUCKET.take()
+        try:
+            return await op(*args, **kwargs)
+        except FloodWaitError as e:
+            logger.warning("Flood wait on %s, sleeping %ds", op.__name__, e.seconds)
+            _WRITE_BUCKET.drain()
+            # The first caller to hit the limit holds the gate; the rest
+            # queue up behind it instead of piling more requests on
+            if gate.is_set():
+                gate.clear()
+                await asyncio.sleep(e.seconds + 0.5)
+                gate.set()
+
+
+async def _delete_messages(client, chat_id, msg_ids, batch=_DELETE_BATCH):
     """
     Delete messages in small batches — now also detects and removes
     entire media groups (albums) by grouped_id.
+
+    msg_ids may be a dict of {id: grouped_id} when the caller already has
+    the messages, which skips fetching them again.
     """
     deleted = 0
     all_to_delete = set(msg_ids)
 
-    # Collect all grouped media siblings
-    async for msg in client.iter_messages(chat_id, ids=msg_ids):
-        if getattr(msg, "grouped_id", None):
-            async for sibling in client.iter_messages(chat_id, reverse=True, limit=50):
-                if getattr(sibling, "grouped_id", None) == msg.grouped_id:
-                    all_to_delete.add(sibling.id)
+    if isinstance(msg_ids, dict):
+        grouped = msg_ids
+    else:
+        grouped = {
+            msg.id: msg.grouped_id
+            async for msg in client.iter_messages(chat_id, ids=msg_ids)
+            if msg is not None
+        }
+
+    # Siblings sit within _ALBUM_MAX ids of each other, so only that window
+    # around each album hit needs fetching
+    groups = set()
+    neighbours = set()
+    for mid, gid in grouped.items():
+        if gid:
+            groups.add(gid)
+            neighbours.update(range(max(1, mid - _ALBUM_MAX + 1), mid + _ALBUM_MAX))
+    neighbours -= all_to_delete
+
+    # A single lookup then covers the siblings of every album
+    if neighbours:
+        async for sibling in client.iter_messages(chat_id, ids=sorted(neighbours)):
+            if getattr(sibling, "grouped_id", None) in groups:
+                all_to_delete.add(sibling.id)
 
     all_to_delete = sorted(all_to_delete)
-    buffer = []
-    for mid in all_to_delete:
-        buffer.append(mid)
-        if len(buffer) >= batch:
-            await client.delete_messages(chat_id, buffer)
-            deleted += len(buffer)
-            buffer.clear()
-            await asyncio.sleep(0.4)
-    if buffer:
-        await client.delete_messages(chat_id, buffer)
-        deleted += len(buffer)
+    chunks = [all_to_delete[i:i + batch] for i in range(0, len(all_to_delete), batch)]
+    sem = asyncio.BoundedSemaphore(_DELETE_CONCURRENCY)
+
+    async def _delete_chunk(chunk):
+        async with sem:
+            await _with_flood(client.delete_messages, chat_id, chunk)
+        return len(chunk)
+
+    # Run batches concurrently, at most _DELETE_CONCURRENCY in flight. Collect
+    # failures instead of raising on the first one, so no batch is left
+    # running unobserved after we return
+    results = await asyncio.gather(
+        *(_delete_chunk(c) for c in chunks), return_exceptions=True
+    )
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                "Delete batch of %d messages in %s failed: %s", len(chunk), chat_id, result
+            )
+        else:
+            deleted += result
     return deleted
 
 
+@functools.lru_cache(maxsize=64)
+def _get_sku_pattern(keyword: str):
+    """Return the compiled SKU pattern for keyword, compiling it on first use."""
+    return re.compile(rf"{re.escape(keyword)}\s*[:：\-_=]\s*([A-Za-z0-9_\-]+)")
+
+
+# (keywords list, compiled pattern) for the current keyword set; reset by
+# _menu_manage_keywords whenever the list is edited
+_KEYWORD_SNAPSHOT = None
+
+
+def _get_combined_pattern(keywords: list):
+    """Return one alternation pattern matching any keyword plus its SKU."""
+    global _KEYWORD_SNAPSHOT
+    if _KEYWORD_SNAPSHOT is None or _KEYWORD_SNAPSHOT[0] is not keywords:
+        alternation = "|".join(re.escape(kw) for kw in keywords)
+        pattern = re.compile(
+            rf"(?P<kw>{alternation})\s*[:：\-_=]\s*(?P<sku>[A-Za-z0-9_\-]+)"
+        )
+        _KEYWORD_SNAPSHOT = (keywords, pattern)
+    return _KEYWORD_SNAPSHOT[1]
+
+
 def _extract_sku(text: str, keyword: str):
     """Extract SKU number following keyword."""
-    pattern = rf"{re.escape(keyword)}\s*[:：\-_=]\s*([A-Za-z0-9_\-]+)"
-    m = re.search(pattern, text)
+    m = _get_sku_pattern(keyword).search(text)
     return m.group(1).strip() if m else None
 
 
@@ -99,6 +220,11 @@ def _pick_channel(config, label="channel"):
 # Auto trigger by enhancer
 # ============================================================
 
+# Lowest message id still worth scanning per (chat, keyword, SKU)
+_SCAN_CURSORS = OrderedDict()
+_SCAN_CURSORS_MAX = 10_000
+
+
 async def run_duplicate_check_for_event(client, config, event):
     """Triggered automatically by enhancer after emoji conversion."""
     keywords = config.get("cleaner", {}).get("keywords", [])
@@ -109,48 +235,74 @@ async def run_duplicate_check_for_event(client, config, event):
     if not text:
         return
 
-    for kw in keywords:
-        if kw.lower() in text.lower():
-            sku = _extract_sku(text, kw)
-            if not sku:
-                continue
-            ids = []
-            async for m in client.iter_messages(event.chat_id, search=sku, limit=400):
-                if isinstance(m, Message) and m.id != msg.id:
-                    if kw in (m.raw_text or "") and sku in (m.raw_text or ""):
-                        ids.append(m.id)
-            if ids:
-                deleted = await _delete_messages(client, event.chat_id, ids)
-                logger.info(
-                    "Cleaner(auto): removed %d duplicates (keyword '%s', SKU '%s')",
-                    deleted,
-                    kw,
-                    sku,
-                )
-            return
+    # Single pass over the text finds both the keyword and its SKU
+    match = _get_combined_pattern(keywords).search(text)
+    if not match:
+        return
+    kw, sku = match.group("kw"), match.group("sku")
+
+    # Older duplicates were already removed when the previous post with this
+    # SKU was handled, so only scan from that post onwards
+    cursor_key = (event.chat_id, kw, sku)
+    min_id = _SCAN_CURSORS.get(cursor_key, 0)
+
+    # Searching for keyword and SKU together lets the server drop posts that
+    # only share the SKU; re-extracting it confirms the hit carries exactly
+    # this SKU, not just a longer one
+    batch = {}
+    async for m in client.iter_messages(
+        event.chat_id, search=f"{kw} {sku}", limit=100, min_id=min_id
+    ):
+        if m.id != msg.id and _extract_sku(m.raw_text or "", kw) == sku:
+            batch[m.id] = m.grouped_id
+    if batch:
+        deleted = await _delete_messages(client, event.chat_id, batch)
+        logger.info(
+            "Cleaner(auto): removed %d duplicates (keyword '%s', SKU '%s')",
+            deleted,
+            kw,
+            sku,
+        )
+
+    # Keep this post in range: it becomes the duplicate of the next one
+    _SCAN_CURSORS[cursor_key] = msg.id - 1
+    _SCAN_CURSORS.move_to_end(cursor_key)
+    if len(_SCAN_CURSORS) > _SCAN_CURSORS_MAX:
+        _SCAN_CURSORS.popitem(last=False)
 
 
 # ============================================================
 # Keyword Management
 # ============================================================
 
+_KEYWORD_MENU = (
+    f"\n{Colors.CYAN}--- Manage Keywords ---{Colors.RESET}\n"
+    f"{Colors.YELLOW}1.{Colors.RESET} Add keyword\n"
+    f"{Colors.YELLOW}2.{Colors.RESET} Delete keyword\n"
+    f"{Colors.YELLOW}3.{Colors.RESET} View keywords\n"
+    f"{Colors.YELLOW}4.{Colors.RESET} Return"
+)
+
+
 async def _menu_manage_keywords(config):
     """Add/Delete/View keywords."""
+    global _KEYWORD_SNAPSHOT
     cleaner_cfg = config.setdefault("cleaner", {})
     keywords = cleaner_cfg.setdefault("keywords", [])
+    # The list keeps display order; the set answers duplicate checks
+    keyword_set = set(keywords)
+    pending = False
     while True:
-        print(f"\n{Colors.CYAN}--- Manage Keywords ---{Colors.RESET}")
-        print(f"{Colors.YELLOW}1.{Colors.RESET} Add keyword")
-        print(f"{Colors.YELLOW}2.{Colors.RESET} Delete keyword")
-        print(f"{Colors.YELLOW}3.{Colors.RESET} View keywords")
-        print(f"{Colors.YELLOW}4.{Colors.RESET} Return")
+        print(_KEYWORD_MENU)
         choice = input("> ").strip()
 
         if choice == "1":
             kw = input("Enter keyword (e.g. شناسه محصول): ").strip()
-            if kw and kw not in keywords:
+            if kw and kw not in keyword_set:
                 keywords.append(kw)
-                save_config(config)
+                keyword_set.add(kw)
+                pending = True
+                _KEYWORD_SNAPSHOT = None
                 print_success(f"Added keyword: {kw}")
             else:
                 print("Invalid or duplicate keyword.")
@@ -163,7 +315,9 @@ async def _menu_manage_keywords(config):
             sel = input("Select number: ").strip()
             if sel.isdigit() and 1 <= int(sel) <= len(keywords):
                 removed = keywords.pop(int(sel) - 1)
-                save_config(config)
+                keyword_set.discard(removed)
+                pending = True
+                _KEYWORD_SNAPSHOT = None
                 print_success(f"Deleted keyword '{removed}'.")
         elif choice == "3":
             if not keywords:
@@ -173,6 +327,9 @@ async def _menu_manage_keywords(config):
                 for i, kw in enumerate(keywords, start=1):
                     print(f"{i}. {kw}")
         elif choice == "4":
+            # Flush all keyword edits in a single write
+            if pending:
+                save_config(config)
             break
         else:
             print("Invalid selection.")
@@ -197,18 +354,25 @@ async def _menu_remove_duplicates(client, chat_id, keywords):
     keyword = keywords[int(sel) - 1]
 
     print("Scanning posts for duplicates...")
-    groups = {}
+    # iter_messages yields newest first, so the first id seen per SKU is the
+    # one to keep and every later hit is a duplicate
+    keepers = {}
+    duplicates = {}
+    grouped = {}
     async for msg in client.iter_messages(chat_id, limit=1000):
-        text = msg.raw_text or ""
+        text = msg.raw_text
+        if not text:
+            continue
         sku = _extract_sku(text, keyword)
-        if sku:
-            groups.setdefault(sku, []).append(msg.id)
+        if not sku:
+            continue
+        if sku in keepers:
+            duplicates.setdefault(sku, []).append(msg.id)
+            grouped[msg.id] = msg.grouped_id
+        else:
+            keepers[sku] = msg.id
 
-    plan = []
-    for sku, ids in groups.items():
-        if len(ids) > 1:
-            ids_sorted = sorted(ids)
-            plan.append((sku, ids_sorted[:-1], ids_sorted[-1]))
+    plan = [(sku, dels, keepers[sku]) for sku, dels in duplicates.items()]
 
     if not plan:
         print_success("No duplicates found.")
@@ -225,9 +389,9 @@ async def _menu_remove_duplicates(client, chat_id, keywords):
         print("Cancelled.")
         return
 
-    deleted_total = 0
-    for _, dels, _ in plan:
-        deleted_total += await _delete_messages(client, chat_id, dels)
+    # One combined {id: grouped_id} map lets _delete_messages pack SKUs into
+    # full batches without fetching the messages again
+    deleted_total = await _delete_messages(client, chat_id, grouped)
     print_success(f"Deleted {deleted_total} duplicates.")
 
 
@@ -237,10 +401,15 @@ async def _menu_delete_by_keyword(client, chat_id):
     if not kw:
         print("No keyword entered.")
         return
-    ids = []
-    async for msg in client.iter_messages(chat_id, limit=400):
-        if kw.lower() in (msg.raw_text or "").lower():
-            ids.append(msg.id)
+    # Case-insensitive search in C, without a lowered copy of every post
+    kw_re = re.compile(re.escape(kw), re.IGNORECASE)
+    ids = {}
+    # Let Telegram's search narrow the scan; the local check guards against
+    # server-side tokenization returning near matches
+    async for msg in client.iter_messages(chat_id, search=kw, limit=400):
+        text = msg.raw_text
+        if text and kw_re.search(text):
+            ids[msg.id] = msg.grouped_id
     if not ids:
         print_warning("No matches.")
         return
@@ -261,38 +430,41 @@ async def _menu_delete_by_date(client, chat_id):
     print(f"{Colors.YELLOW}4.{Colors.RESET} Last N messages (quick)")
     print(f"{Colors.YELLOW}5.{Colors.RESET} Return")
     choice = input("> ").strip()
-    now = datetime.utcnow()
-    ids = []
+    ids = {}
 
     if choice == "1":
         days = int(input("Delete messages older than how many days?: ").strip())
-        cutoff = now - timedelta(days=days)
-        async for msg in client.iter_messages(chat_id, limit=1500):
-            if msg.date and msg.date.replace(tzinfo=None) < cutoff:
-                ids.append(msg.id)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        # offset_date makes Telegram return only messages older than cutoff
+        async for msg in client.iter_messages(chat_id, offset_date=cutoff, limit=1500):
+            ids[msg.id] = msg.grouped_id
         note = f"older than {days} days"
 
     elif choice == "2":
         s = input("Start date (YYYY-MM-DD): ").strip()
         e = input("End date (YYYY-MM-DD): ").strip()
-        start = datetime.strptime(s, "%Y-%m-%d")
-        end = datetime.strptime(e, "%Y-%m-%d")
-        async for msg in client.iter_messages(chat_id, limit=2000):
-            if msg.date and start <= msg.date.replace(tzinfo=None) <= end:
-                ids.append(msg.id)
+        # Parse as UTC once so message dates compare without per-message copies
+        start = datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(e, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        # Start paging at the end date and stop once we walk past the start date
+        async for msg in client.iter_messages(chat_id, offset_date=end, limit=2000):
+            if msg.date and msg.date < start:
+                break
+            ids[msg.id] = msg.grouped_id
         note = f"between {s} and {e}"
 
     elif choice == "3":
-        cutoff = datetime.strptime(input("Delete before (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
-        async for msg in client.iter_messages(chat_id, limit=2000):
-            if msg.date and msg.date.replace(tzinfo=None) < cutoff:
-                ids.append(msg.id)
+        cutoff = datetime.strptime(
+            input("Delete before (YYYY-MM-DD): ").strip(), "%Y-%m-%d"
+        ).replace(tzinfo=timezone.utc)
+        async for msg in client.iter_messages(chat_id, offset_date=cutoff, limit=2000):
+            ids[msg.id] = msg.grouped_id
         note = f"before {cutoff.date()}"
 
     elif choice == "4":
         n = int(input("How many recent messages to delete?: ").strip())
         async for msg in client.iter_messages(chat_id, limit=n):
-            ids.append(msg.id)
+            ids[msg.id] = msg.grouped_id
         note = f"last {n} messages"
 
     elif choice == "5":
@@ -316,6 +488,12 @@ async def _menu_delete_by_date(client, chat_id):
 # Improved Forward / Copy
 # ============================================================
 
+# Reupload media up to this size through memory instead of a temp file
+_REUPLOAD_IN_MEMORY_MAX = 10 * 1024 * 1024
+# Messages per forward request (Telegram's limit)
+_FORWARD_BATCH = 100
+
+
 async def _menu_forward_copy(client, config):
     """Forward, copy, or reupload messages between channels."""
     src = _pick_channel(config, "source channel (copy from)")
@@ -355,29 +533,92 @@ async def _menu_forward_copy(client, config):
         print("Cancelled.")
         return
 
-    msgs = []
-    async for m in client.iter_messages(src, limit=start_from + count):
-        msgs.append(m)
-    msgs = msgs[start_from: start_from + count]
+    # Resolve the window's newest message once, then page by id from there.
+    # add_offset on the iterator itself is re-applied at every page boundary,
+    # which skips messages once the window spans more than one page.
+    offset_id = 0
+    if start_from:
+        anchor = await client.get_messages(src, limit=1, add_offset=start_from)
+        if not anchor:
+            print_warning("No messages at that offset.")
+            return
+        offset_id = anchor[0].id + 1
+    msgs = [m async for m in client.iter_messages(src, limit=count, offset_id=offset_id)]
     if reverse:
         msgs.reverse()
 
+    async def _download(msg):
+        """Fetch media for reupload: in memory when small, else to a temp file."""
+        if not msg.media:
+            return None
+        if msg.file and (msg.file.size or 0) <= _REUPLOAD_IN_MEMORY_MAX:
+            # Small files skip the disk; the name keeps Telethon's type detection
+            media = io.BytesIO(await client.download_media(msg, file=bytes))
+            media.name = msg.file.name or f"media{msg.file.ext or ''}"
+            return media
+        return await client.download_media(msg)
+
+    async def _send_file(media, **kwargs):
+        # A flood-wait retry reuses the same buffer, so start every attempt
+        # from the top instead of wherever the last upload stopped
+        if isinstance(media, io.BytesIO):
+            media.seek(0)
+        return await client.send_file(target, media, **kwargs)
+
+    async def _transfer(msg, media=None):
+        if mode == "2":
+            await _with_flood(client.send_message, target, msg.raw_text or "")
+        elif mode == "3" and media is not None:
+            try:
+                # Carry the original document attributes (file name, duration,
+                # dimensions) over instead of letting Telethon re-derive them
+                await _with_flood(
+                    _send_file,
+                    media,
+                    caption=msg.raw_text or "",
+                    attributes=msg.document.attributes if msg.document else None,
+                )
+            finally:
+                if isinstance(media, str):
+                    os.remove(media)
+
     sent = 0
-    for msg in msgs:
-        try:
-            if mode == "1":
-                await client.forward_messages(target, msg)
-            elif mode == "2":
-                await client.send_message(target, msg.raw_text or "")
-            elif mode == "3":
-                if msg.media:
-                    path = await client.download_media(msg)
-                    await client.send_file(target, path, caption=msg.raw_text or "")
-                    os.remove(path)
-            sent += 1
-            await asyncio.sleep(0.3)
-        except Exception as e:
-            logger.error("Forward/copy failed: %s", e)
+    if mode == "1":
+        # A single forward request carries a whole chunk, in order. Service
+        # messages can't be forwarded and would fail the chunk they sit in.
+        fwd = [m for m in msgs if m.action is None]
+        for i in range(0, len(fwd), _FORWARD_BATCH):
+            chunk = fwd[i:i + _FORWARD_BATCH]
+            try:
+                await _with_flood(client.forward_messages, target, chunk)
+                sent += len(chunk)
+                continue
+            except Exception as e:
+                logger.error("Forward/copy failed, retrying one by one: %s", e)
+            for m in chunk:
+                try:
+                    await _with_flood(client.forward_messages, target, m)
+                    sent += 1
+                except Exception as e:
+                    logger.error("Forward/copy failed for message %s: %s", m.id, e)
+    else:
+        # Reupload downloads the next message's media while the current one uploads
+        upcoming = asyncio.create_task(_download(msgs[0])) if mode == "3" and msgs else None
+        for i, msg in enumerate(msgs):
+            try:
+                media = None
+                if upcoming is not None:
+                    current = upcoming
+                    upcoming = (
+                        asyncio.create_task(_download(msgs[i + 1]))
+                        if i + 1 < len(msgs)
+                        else None
+                    )
+                    media = await current
+                await _transfer(msg, media)
+                sent += 1
+            except Exception as e:
+                logger.error("Forward/copy failed: %s", e)
     print_success(f"Transferred {sent} messages from {src} → {target}.")
 
 
@@ -438,10 +679,13 @@ async def start_cleaner(auto=False):
         f"cleaner_{phone}.session", int(creds["api_id"]), creds["api_hash"]
     )
     await client.start(phone=phone)
-    if auto:
-        pass
-    else:
-        await _interactive_menu(client, config)
+    try:
+        if auto:
+            pass
+        else:
+            await _interactive_menu(client, config)
+    finally:
+        await client.disconnect()
 
 
 async def run_cleaner(config=None, auto=False):
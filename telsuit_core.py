@@ -1,6 +1,9 @@
+import asyncio
 import json
 import logging
 import os
+import time
+from logging.handlers import RotatingFileHandler
 
 
 # --- 🎨 Colors ---
@@ -16,15 +19,24 @@ class Colors:
 # --- ⚙️ Config Setup ---
 CONFIG_FILE = 'telsuit-config.json'
 
+# Parsed config shared by every module in this process
+_config_cache = None
+
 
 def get_config():
-    """Load configuration from disk."""
+    """Load configuration from disk (parsed once, then served from memory)."""
+    global _config_cache
+    if _config_cache is not None:
+        return _config_cache
+
     if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            try:
-                cfg = json.load(f)
-            except json.JSONDecodeError:
-                cfg = {}
+        # Read the whole file in one call and parse the raw bytes directly
+        with open(CONFIG_FILE, 'rb') as f:
+            data = f.read()
+        try:
+            cfg = json.loads(data)
+        except json.JSONDecodeError:
+            cfg = {}
     else:
         cfg = {}
 
@@ -38,24 +50,38 @@ def get_config():
         "forward_channels": [],
         "delete_rules": {}
     })
+    _config_cache = cfg
     return cfg
 
 
 def save_config(config):
     """Save configuration to disk."""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+    global _config_cache
+    _config_cache = config
+    # Encode up front so the file is written with a single write() call
+    data = json.dumps(config, indent=4).encode("utf-8")
+    # Write a sibling temp file and swap it in, so a crash mid-save never
+    # leaves a truncated config behind
+    tmp_path = CONFIG_FILE + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, CONFIG_FILE)
     logger.info(f"Configuration saved to {CONFIG_FILE}")
 
 
 # --- 🧠 Logging Setup ---
 LOG_FILE = os.path.join(os.getcwd(), "telsuit.log")
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
     handlers=[
-        logging.FileHandler(LOG_FILE),
+        RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS),
         logging.StreamHandler()
     ]
 )
@@ -82,3 +108,38 @@ def print_warning(message):
 def print_error(message):
     """Prints an error message."""
     print(f"{Colors.RED}✖ {message}{Colors.RESET}")
+
+
+# --- ⏱️ Rate Limiting ---
+class TokenBucket:
+    """Refilling token bucket: allows short bursts, then paces to `rate` per second."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # Created on first use: before 3.10 asyncio primitives bind to the
+        # loop current at construction, which is not the asyncio.run loop
+        self._lock = None
+        self._loop = None
+
+    async def take(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def drain(self):
+        """Empty the bucket so calls restart slowly after a flood wait."""
+        self.tokens = 0
+        self.updated = time.monotonic()
@@ -2,8 +2,9 @@ import re
 import asyncio
 from asyncio import Queue
 from telethon import TelegramClient, events
+from telethon.errors import FloodWaitError
 from telethon.tl.types import MessageEntityCustomEmoji
-from telsuit_core import get_config, logger
+from telsuit_core import TokenBucket, get_config, logger
 from telsuit_cleaner import run_duplicate_check_for_event
 
 
@@ -25,7 +26,8 @@ async def start_enhancer(auto=False):
     # Auto-select admin for background/headless mode
     if auto:
         selected_admin = admins[0]
-        print(f"🤖 Auto-selected admin: {selected_admin}")
+        # Headless runs go to the log instead of a (possibly piped) stdout
+        logger.info(f"🤖 Auto-selected admin: {selected_admin}")
     else:
         print("\n--- Available Admins ---")
         for i, phone in enumerate(admins, start=1):
@@ -41,15 +43,52 @@ async def start_enhancer(auto=False):
 
     client = TelegramClient(f"enhancer_{phone}.session", int(api_id), api_hash)
 
+    # --- One pattern for every mapped emoji, longest first so multi-codepoint
+    # emojis win over their prefixes ---
+    emoji_ids = {}
+    for emoji, doc_id in config["emoji_map"].items():
+        try:
+            emoji_ids[emoji] = int(doc_id)
+        except (TypeError, ValueError):
+            # One bad entry should not take the whole enhancer down
+            logger.error(f"⚠️ Skipping emoji {emoji}: invalid custom emoji ID {doc_id!r}")
+    emoji_pattern = None
+    if emoji_ids:
+        emoji_pattern = re.compile(
+            "|".join(re.escape(e) for e in sorted(emoji_ids, key=len, reverse=True))
+        )
+
     # --- Shared async queue to serialize message processing ---
+    # The queue carries (chat, message id) keys; pending holds the latest
+    # event for each, so repeated edits of a waiting message collapse into one job
     message_queue = Queue()
+    pending = {}
     processing = False
 
+    # --- Edit pacing: short bursts pass straight through, sustained load is
+    # held to the bucket rate. Flood waits cut the rate; each successful edit
+    # wins a little of it back, up to the starting rate ---
+    edit_rate = 1.0
+    edit_bucket = TokenBucket(rate=edit_rate, capacity=5)
+
+    async def edit_with_backoff(event, text, entities):
+        """Edit under the rate limiter; on a flood wait slow down and retry once."""
+        await edit_bucket.take()
+        try:
+            await event.edit(text, formatting_entities=entities)
+        except FloodWaitError as e:
+            edit_bucket.rate = max(0.1, edit_bucket.rate * 0.8)
+            edit_bucket.drain()
+            logger.warning(f"⏳ Flood wait on edit, sleeping {e.seconds}s")
+            await asyncio.sleep(e.seconds)
+            await event.edit(text, formatting_entities=entities)
+        edit_bucket.rate = min(edit_rate, edit_bucket.rate + 0.05)
+
     # --- Actual emoji enhancement logic ---
-    async def process_single_message(event):
+    async def process_single_message(event, is_new):
         """Enhance emojis and trigger cleaner when done."""
         text = event.message.text
-        if not text:
+        if not text or emoji_pattern is None:
             return
 
         try:
@@ -59,25 +98,31 @@ async def start_enhancer(auto=False):
                 text=text, parse_mode="md"
             )
 
-        matches = []
-        for emoji, doc_id in config["emoji_map"].items():
-            for m in re.finditer(re.escape(emoji), parsed_text):
-                matches.append((m.start(), m.end(), emoji, int(doc_id)))
+        # A single scan yields every emoji already in text order
+        matches = [
+            (m.start(), m.end(), m.group(), emoji_ids[m.group()])
+            for m in emoji_pattern.finditer(parsed_text)
+        ]
 
         if not matches:
             return
 
-        matches.sort(key=lambda x: x[0])
+        # Telegram offsets count UTF-16 code units; advance a running offset
+        # over the gap since the previous match instead of re-encoding the
+        # whole prefix for every emoji
         new_entities = []
+        offset = 0
+        pos = 0
         for start, end, emoji, doc_id in matches:
-            prefix = parsed_text[:start]
-            offset = len(prefix.encode("utf-16-le")) // 2
+            offset += len(parsed_text[pos:start].encode("utf-16-le")) // 2
             length = len(emoji.encode("utf-16-le")) // 2
             new_entities.append(
                 MessageEntityCustomEmoji(
                     offset=offset, length=length, document_id=doc_id
                 )
             )
+            offset += length
+            pos = end
 
         final_entities = (parsed_entities or []) + new_entities
         final_entities.sort(key=lambda e: e.offset)
@@ -85,14 +130,14 @@ async def start_enhancer(auto=False):
         msg = event.message
 
         try:
-            await event.edit(parsed_text, formatting_entities=final_entities)
+            await edit_with_backoff(event, parsed_text, final_entities)
             logger.info(f"✅ Enhanced message {msg.id} in {event.chat.username}")
         except Exception as e:
             logger.error(f"❌ Failed editing message {msg.id}: {e}")
         finally:
             try:
                 # ✅ Only trigger cleaner for NEW messages (not edits)
-                if getattr(msg, "edit_date", None):
+                if not is_new:
                     logger.debug(
                         f"✏️ Edit detected for message {msg.id} — cleaner not triggered"
                     )
@@ -113,8 +158,15 @@ async def start_enhancer(auto=False):
 
     # --- Event Handler: queue incoming messages ---
     async def handle_message(event):
-        """Push each new message or edit into queue to process sequentially."""
-        await message_queue.put(event)
+        """Queue each message once; a later edit replaces the event still waiting."""
+        key = (event.chat_id, event.message.id)
+        is_new = not getattr(event.message, "edit_date", None)
+        if key in pending:
+            # Keep the newest text, but a post that arrived as new stays new
+            pending[key] = (event, is_new or pending[key][1])
+        else:
+            pending[key] = (event, is_new)
+            await message_queue.put(key)
 
     # --- Queue worker to process messages one-by-one ---
     async def process_queue():
@@ -124,14 +176,13 @@ async def start_enhancer(auto=False):
         processing = True
 
         while True:
-            event = await message_queue.get()
+            event, is_new = pending.pop(await message_queue.get())
             try:
-                await process_single_message(event)
+                await process_single_message(event, is_new)
             except Exception as e:
                 logger.error(f"Queue error: {e}")
             finally:
                 message_queue.task_done()
-                await asyncio.sleep(2)  # Delay between processing messages
 
     # --- Register event handlers ---
     for ch in config["channels"]:
@@ -159,8 +210,18 @@ if __name__ == "__main__":
     # 'asyncio' is already imported at the top, removing the redundant import here fixes F811
 
     auto_mode = "--headless" in sys.argv
+
+    # Use the libuv-based event loop when available
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
     try:
         # The 'asyncio' module is available from the top-level import
-        asyncio.run(start_enhancer(auto=auto_mode))
+        if uvloop:
+            uvloop.run(start_enhancer(auto=auto_mode))
+        else:
+            asyncio.run(start_enhancer(auto=auto_mode))
     except KeyboardInterrupt:
         print("🛑 TelSuit stopped by user.")